@@ -6,6 +6,7 @@ Allows namespace creation, world generation, and agent registration.
 import json
 import math
 import streamlit as st
+from itertools import product
 from pathlib import Path
 from PIL import Image, ImageDraw, ImageFont
 
@@ -46,10 +47,7 @@ def get_world_state_at_tick(conn, supertick_id: int):
     height = int(cursor.fetchone()[0])
 
     # Initialize all tiles as white
-    tiles = {}
-    for x in range(width):
-        for y in range(height):
-            tiles[(x, y)] = "#FFFFFF"
+    tiles = dict.fromkeys(product(range(width), range(height)), "#FFFFFF")
 
     # Apply all tile changes up to and including the requested supertick
     cursor = conn.execute(
@@ -224,9 +222,9 @@ def render_world(conn, tile_size: int = 8, supertick_id: int = None, current_tic
             draw.rectangle([x1, y1, x2, y2], fill=normalize_color(color))
     else:
         # Use current state
-        cursor = conn.execute("SELECT x, y, color FROM tiles")
-        for row in cursor.fetchall():
-            x, y, color = row
+        for idx, color in enumerate(db_manager.get_tiles(conn)):
+            x = idx % width
+            y = idx // width
             x1 = x * tile_size
             y1 = y * tile_size
             x2 = x1 + tile_size
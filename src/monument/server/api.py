@@ -132,14 +132,11 @@ def build_hud(
     width = int(meta.get('width', 64))
     height = int(meta.get('height', 64))
 
-    # Get all tiles (full map visibility, no viewport restriction)
-    cursor = conn.execute(
-        """
-        SELECT x, y, color FROM tiles
-        ORDER BY y, x
-        """
-    )
-    visible_tiles = cursor.fetchall()
+    # Get all tiles (full map visibility, no viewport restriction), ordered by y, x
+    visible_tiles = [
+        (idx % width, idx // width, color)
+        for idx, color in enumerate(db_manager.get_tiles(conn))
+    ]
     tile_map = {(tx, ty): color for tx, ty, color in visible_tiles}
 
     # Build HUD sections
@@ -6,10 +6,41 @@ Handles BSP tick loop: COLLECT → MERGE → BROADCAST
 import json
 import sqlite3
 import time
+from collections import defaultdict
 from typing import List, Dict, Tuple, Optional
 
 from monument.server.db import db_manager
 
+# Everything can_advance_tick needs, fetched in a single round-trip.
+# journal's (supertick_id, actor_id) primary key means one row per actor, so no DISTINCT.
+ADVANCE_CHECK_SQL = """
+    WITH m AS (SELECT key, value FROM meta)
+    SELECT
+        (SELECT value FROM m WHERE key = 'supertick_id'),
+        (SELECT value FROM m WHERE key = 'epoch'),
+        (SELECT value FROM m WHERE key = 'phase'),
+        (SELECT COUNT(*) FROM actors WHERE eliminated_at IS NULL),
+        (SELECT COUNT(*) FROM journal
+         WHERE supertick_id = CAST((SELECT value FROM m WHERE key = 'supertick_id') AS INTEGER)
+           AND status = 'pending')
+"""
+
+# World state needed at the start of MERGE, as a single row
+MERGE_META_SQL = """
+    WITH m AS (SELECT key, value FROM meta)
+    SELECT
+        (SELECT value FROM m WHERE key = 'supertick_id'),
+        (SELECT value FROM m WHERE key = 'width'),
+        (SELECT value FROM m WHERE key = 'height'),
+        (SELECT value FROM m WHERE key = 'epoch')
+"""
+
+# MOVE direction -> (dx, dy); the direction is also the new facing
+DIRECTION_DELTAS = {'N': (0, -1), 'S': (0, 1), 'E': (1, 0), 'W': (-1, 0)}
+
+# Refresh query planner statistics every N ticks (see merge_and_advance_tick)
+OPTIMIZE_EVERY_TICKS = 100
+
 
 def can_advance_tick(namespace: str) -> Tuple[bool, str]:
     """
@@ -19,41 +50,24 @@ def can_advance_tick(namespace: str) -> Tuple[bool, str]:
         (can_advance, reason)
     """
     conn = db_manager.get_connection(namespace)
-    cursor = conn.cursor()
 
-    # Get current state
-    cursor.execute("SELECT key, value FROM meta")
-    meta = {row[0]: row[1] for row in cursor.fetchall()}
+    # Get current state, registered agents and submissions in one query
+    row = conn.execute(ADVANCE_CHECK_SQL).fetchone()
+    conn.close()
 
-    supertick_id = int(meta.get('supertick_id', 0))
-    epoch = int(meta.get('epoch', 0))
-    phase = meta.get('phase', 'SETUP')
+    supertick_id = int(row[0] or 0)
+    epoch = int(row[1] or 0)
+    phase = row[2] or 'SETUP'
+    total_agents = row[3]
+    submitted_agents = row[4]
 
     # Check if already at epoch limit
     if supertick_id >= epoch:
-        conn.close()
         return False, f"Reached epoch limit ({epoch} ticks). Set new epoch to continue."
 
     # Check if in SETUP (no agents registered yet)
-    if phase == 'SETUP':
-        cursor.execute("SELECT COUNT(*) FROM actors WHERE eliminated_at IS NULL")
-        agent_count = cursor.fetchone()[0]
-        if agent_count == 0:
-            conn.close()
-            return False, "No agents registered yet"
-
-    # Count registered agents
-    cursor.execute("SELECT COUNT(*) FROM actors WHERE eliminated_at IS NULL")
-    total_agents = cursor.fetchone()[0]
-
-    # Count submitted actions for current tick
-    cursor.execute(
-        "SELECT COUNT(DISTINCT actor_id) FROM journal WHERE supertick_id = ? AND status = 'pending'",
-        (supertick_id,)
-    )
-    submitted_agents = cursor.fetchone()[0]
-
-    conn.close()
+    if phase == 'SETUP' and total_agents == 0:
+        return False, "No agents registered yet"
 
     if submitted_agents < total_agents:
         return False, f"Waiting for agents: {submitted_agents}/{total_agents} submitted"
@@ -72,12 +86,11 @@ def merge_and_advance_tick(namespace: str) -> Dict:
     cursor = conn.cursor()
 
     # Get current state
-    cursor.execute("SELECT key, value FROM meta")
-    meta = {row[0]: row[1] for row in cursor.fetchall()}
-
-    current_tick = int(meta.get('supertick_id', 0))
-    width = int(meta.get('width', 64))
-    height = int(meta.get('height', 64))
+    row = cursor.execute(MERGE_META_SQL).fetchone()
+    current_tick = int(row[0] or 0)
+    width = int(row[1] or 64)
+    height = int(row[2] or 64)
+    epoch = int(row[3] or 0)
 
     # Gather pending actions
     cursor.execute(
@@ -86,6 +99,12 @@ def merge_and_advance_tick(namespace: str) -> Dict:
     )
     pending_actions = cursor.fetchall()
 
+    # Preload every actor position once instead of one SELECT per action
+    actor_positions = {
+        actor_id: (x, y, facing)
+        for actor_id, x, y, facing in cursor.execute("SELECT id, x, y, facing FROM actors")
+    }
+
     # Process actions
     results = {
         'tick': current_tick,
@@ -96,138 +115,103 @@ def merge_and_advance_tick(namespace: str) -> Dict:
         'no_op': 0
     }
 
-    # Group actions by type for conflict detection
-    moves = []  # (actor_id, dest_x, dest_y, params_json)
-    paints = []  # (actor_id, tile_x, tile_y, color, params_json)
+    # Group actions by target for conflict detection
+    move_destinations = defaultdict(list)  # (dest_x, dest_y) -> [(actor_id, new_facing, params_json)]
+    paint_tiles = defaultdict(list)  # (tile_x, tile_y) -> [(actor_id, color, params_json)]
     speaks = []  # (actor_id, message, params_json)
 
+    # Writes are collected while resolving and applied in batches at the end
+    now = int(time.time())
+    journal_updates = []  # (status, result_json, supertick_id, actor_id)
+    actor_moves = []  # (x, y, facing, actor_id)
+    actor_history_rows = []  # (actor_id, supertick_id, x, y, facing, created_at)
+    tile_paints = []  # (x, y, color)
+    tile_history_rows = []  # (x, y, supertick_id, actor_id, old_color, new_color, created_at)
+    chat_rows = []  # (supertick_id, from_id, message, created_at)
+
     for actor_id, intent, params_json in pending_actions:
         params = json.loads(params_json)
         params_str = params.get('params', '')
 
         if intent == 'MOVE':
             # Get current position
-            cursor.execute("SELECT x, y, facing FROM actors WHERE id = ?", (actor_id,))
-            row = cursor.fetchone()
-            if not row:
+            position = actor_positions.get(actor_id)
+            if position is None:
                 continue
-            x, y, facing = row
+            x, y, facing = position
 
             # Parse direction
             direction = params_str.strip().upper()
 
             # Validate direction
-            if direction not in ['N', 'S', 'E', 'W']:
+            delta = DIRECTION_DELTAS.get(direction)
+            if delta is None:
                 # Invalid direction - mark as invalid
-                cursor.execute(
-                    "UPDATE journal SET status = 'rejected', result_json = ? WHERE supertick_id = ? AND actor_id = ?",
-                    (json.dumps({'outcome': 'INVALID', 'reason': f'Invalid direction "{params_str}". Must be N, S, E, or W'}), current_tick, actor_id)
-                )
+                journal_updates.append((
+                    'rejected',
+                    json.dumps({'outcome': 'INVALID', 'reason': f'Invalid direction "{params_str}". Must be N, S, E, or W'}),
+                    current_tick, actor_id
+                ))
                 results['invalid'] += 1
                 continue
 
-            dest_x, dest_y = x, y
+            # Step one tile, clamped to the world bounds
+            dx, dy = delta
+            dest_x = min(width - 1, max(0, x + dx))
+            dest_y = min(height - 1, max(0, y + dy))
             new_facing = direction
 
-            if direction == 'N':
-                dest_y = max(0, y - 1)
-            elif direction == 'S':
-                dest_y = min(height - 1, y + 1)
-            elif direction == 'E':
-                dest_x = min(width - 1, x + 1)
-            elif direction == 'W':
-                dest_x = max(0, x - 1)
-
-            moves.append((actor_id, dest_x, dest_y, new_facing, params_json))
+            move_destinations[(dest_x, dest_y)].append((actor_id, new_facing, params_json))
 
         elif intent == 'PAINT':
             # Get current position - agents can only paint their current tile
-            cursor.execute("SELECT x, y FROM actors WHERE id = ?", (actor_id,))
-            row = cursor.fetchone()
-            if not row:
+            position = actor_positions.get(actor_id)
+            if position is None:
                 continue
-            tile_x, tile_y = row
+            tile_x, tile_y, _ = position
 
             # Parse color only
             color = params_str.strip()
             if color:
-                paints.append((actor_id, tile_x, tile_y, color, params_json))
+                paint_tiles[(tile_x, tile_y)].append((actor_id, color, params_json))
 
         elif intent == 'SPEAK':
             speaks.append((actor_id, params_str, params_json))
 
     # Resolve MOVE conflicts (deterministic by actor_id)
-    move_destinations = {}  # (dest_x, dest_y) -> [actor_ids]
-    for actor_id, dest_x, dest_y, new_facing, params_json in moves:
-        key = (dest_x, dest_y)
-        if key not in move_destinations:
-            move_destinations[key] = []
-        move_destinations[key].append((actor_id, new_facing, params_json))
-
     for (dest_x, dest_y), actors_list in move_destinations.items():
         if len(actors_list) == 1:
             # No conflict
             actor_id, new_facing, params_json = actors_list[0]
-            # Apply move
-            cursor.execute(
-                "UPDATE actors SET x = ?, y = ?, facing = ? WHERE id = ?",
-                (dest_x, dest_y, new_facing, actor_id)
-            )
-            # Record in actor_history
-            cursor.execute(
-                "INSERT INTO actor_history (actor_id, supertick_id, x, y, facing, created_at) VALUES (?, ?, ?, ?, ?, ?)",
-                (actor_id, current_tick, dest_x, dest_y, new_facing, int(time.time()))
-            )
-            # Mark as committed
-            cursor.execute(
-                "UPDATE journal SET status = 'committed', result_json = ? WHERE supertick_id = ? AND actor_id = ?",
-                (json.dumps({'outcome': 'SUCCESS', 'reason': f'Moved to ({dest_x}, {dest_y})'}), current_tick, actor_id)
-            )
-            results['success'] += 1
+            reason = f'Moved to ({dest_x}, {dest_y})'
+            losers = []
         else:
             # Conflict - sort by actor_id for determinism
             sorted_actors = sorted(actors_list, key=lambda x: x[0])
-            winner = sorted_actors[0]
+            actor_id, new_facing, params_json = sorted_actors[0]
+            reason = f'Won conflict, moved to ({dest_x}, {dest_y})'
             losers = sorted_actors[1:]
 
-            # Winner moves
-            actor_id, new_facing, params_json = winner
-            cursor.execute(
-                "UPDATE actors SET x = ?, y = ?, facing = ? WHERE id = ?",
-                (dest_x, dest_y, new_facing, actor_id)
-            )
-            # Record in actor_history
-            cursor.execute(
-                "INSERT INTO actor_history (actor_id, supertick_id, x, y, facing, created_at) VALUES (?, ?, ?, ?, ?, ?)",
-                (actor_id, current_tick, dest_x, dest_y, new_facing, int(time.time()))
-            )
-            cursor.execute(
-                "UPDATE journal SET status = 'committed', result_json = ? WHERE supertick_id = ? AND actor_id = ?",
-                (json.dumps({'outcome': 'SUCCESS', 'reason': f'Won conflict, moved to ({dest_x}, {dest_y})'}), current_tick, actor_id)
-            )
-            results['success'] += 1
-
-            # Losers stay in place
-            for actor_id, new_facing, params_json in losers:
-                cursor.execute(
-                    "UPDATE journal SET status = 'rejected', result_json = ? WHERE supertick_id = ? AND actor_id = ?",
-                    (json.dumps({'outcome': 'CONFLICT_LOST', 'reason': f'Lost move conflict to {winner[0]}'}), current_tick, actor_id)
-                )
-                results['conflict_lost'] += 1
+        # Winner moves and is recorded in actor_history
+        actor_moves.append((dest_x, dest_y, new_facing, actor_id))
+        actor_history_rows.append((actor_id, current_tick, dest_x, dest_y, new_facing, now))
+        journal_updates.append(('committed', json.dumps({'outcome': 'SUCCESS', 'reason': reason}), current_tick, actor_id))
+        results['success'] += 1
 
-    # Resolve PAINT conflicts (deterministic by actor_id)
-    paint_tiles = {}  # (tile_x, tile_y) -> [actor_ids]
-    for actor_id, tile_x, tile_y, color, params_json in paints:
-        key = (tile_x, tile_y)
-        if key not in paint_tiles:
-            paint_tiles[key] = []
-        paint_tiles[key].append((actor_id, color, params_json))
+        # Losers stay in place
+        for loser_id, _, _ in losers:
+            journal_updates.append((
+                'rejected',
+                json.dumps({'outcome': 'CONFLICT_LOST', 'reason': f'Lost move conflict to {actor_id}'}),
+                current_tick, loser_id
+            ))
+            results['conflict_lost'] += 1
 
+    # Resolve PAINT conflicts (deterministic by actor_id)
+    tile_colors = db_manager.get_tiles(conn) if paint_tiles else []
     for (tile_x, tile_y), actors_list in paint_tiles.items():
         # Get current tile color
-        cursor.execute("SELECT color FROM tiles WHERE x = ? AND y = ?", (tile_x, tile_y))
-        row = cursor.fetchone()
-        current_color = row[0] if row else "#FFFFFF"
+        current_color = tile_colors[tile_y * width + tile_x]
 
         if len(actors_list) == 1:
             # No conflict
@@ -235,70 +219,64 @@ def merge_and_advance_tick(namespace: str) -> Dict:
 
             if color == current_color:
                 # NO_OP - already that color
-                cursor.execute(
-                    "UPDATE journal SET status = 'committed', result_json = ? WHERE supertick_id = ? AND actor_id = ?",
-                    (json.dumps({'outcome': 'NO_OP', 'reason': f'Tile already {color}'}), current_tick, actor_id)
-                )
+                journal_updates.append((
+                    'committed',
+                    json.dumps({'outcome': 'NO_OP', 'reason': f'Tile already {color}'}),
+                    current_tick, actor_id
+                ))
                 results['no_op'] += 1
-            else:
-                # Apply paint
-                cursor.execute(
-                    "UPDATE tiles SET color = ? WHERE x = ? AND y = ?",
-                    (color, tile_x, tile_y)
-                )
-                # Record in tile_history
-                cursor.execute(
-                    "INSERT INTO tile_history (x, y, supertick_id, actor_id, action_type, old_color, new_color, created_at) VALUES (?, ?, ?, ?, 'PAINT', ?, ?, ?)",
-                    (tile_x, tile_y, current_tick, actor_id, current_color, color, int(time.time()))
-                )
-                cursor.execute(
-                    "UPDATE journal SET status = 'committed', result_json = ? WHERE supertick_id = ? AND actor_id = ?",
-                    (json.dumps({'outcome': 'SUCCESS', 'reason': f'Painted ({tile_x}, {tile_y}) {color}'}), current_tick, actor_id)
-                )
-                results['success'] += 1
+                continue
+
+            reason = f'Painted ({tile_x}, {tile_y}) {color}'
+            losers = []
         else:
             # Conflict - sort by actor_id for determinism
             sorted_actors = sorted(actors_list, key=lambda x: x[0])
-            winner = sorted_actors[0]
+            actor_id, color, params_json = sorted_actors[0]
+            reason = f'Won conflict, painted ({tile_x}, {tile_y}) {color}'
             losers = sorted_actors[1:]
 
-            # Winner paints
-            actor_id, color, params_json = winner
-            cursor.execute(
-                "UPDATE tiles SET color = ? WHERE x = ? AND y = ?",
-                (color, tile_x, tile_y)
-            )
-            cursor.execute(
-                "INSERT INTO tile_history (x, y, supertick_id, actor_id, action_type, old_color, new_color, created_at) VALUES (?, ?, ?, ?, 'PAINT', ?, ?, ?)",
-                (tile_x, tile_y, current_tick, actor_id, current_color, color, int(time.time()))
-            )
-            cursor.execute(
-                "UPDATE journal SET status = 'committed', result_json = ? WHERE supertick_id = ? AND actor_id = ?",
-                (json.dumps({'outcome': 'SUCCESS', 'reason': f'Won conflict, painted ({tile_x}, {tile_y}) {color}'}), current_tick, actor_id)
-            )
-            results['success'] += 1
-
-            # Losers don't paint
-            for actor_id, color, params_json in losers:
-                cursor.execute(
-                    "UPDATE journal SET status = 'rejected', result_json = ? WHERE supertick_id = ? AND actor_id = ?",
-                    (json.dumps({'outcome': 'CONFLICT_LOST', 'reason': f'Lost paint conflict to {winner[0]}'}), current_tick, actor_id)
-                )
-                results['conflict_lost'] += 1
+        # Winner paints and is recorded in tile_history
+        tile_paints.append((tile_x, tile_y, color))
+        tile_history_rows.append((tile_x, tile_y, current_tick, actor_id, current_color, color, now))
+        journal_updates.append(('committed', json.dumps({'outcome': 'SUCCESS', 'reason': reason}), current_tick, actor_id))
+        results['success'] += 1
+
+        # Losers don't paint
+        for loser_id, _, _ in losers:
+            journal_updates.append((
+                'rejected',
+                json.dumps({'outcome': 'CONFLICT_LOST', 'reason': f'Lost paint conflict to {actor_id}'}),
+                current_tick, loser_id
+            ))
+            results['conflict_lost'] += 1
 
     # Process SPEAK actions (no conflicts)
     for actor_id, message, params_json in speaks:
-        # Insert into chat
-        cursor.execute(
-            "INSERT INTO chat (supertick_id, from_id, message, created_at) VALUES (?, ?, ?, ?)",
-            (current_tick, actor_id, message, int(time.time()))
-        )
-        cursor.execute(
-            "UPDATE journal SET status = 'committed', result_json = ? WHERE supertick_id = ? AND actor_id = ?",
-            (json.dumps({'outcome': 'SUCCESS', 'reason': 'Message sent'}), current_tick, actor_id)
-        )
+        chat_rows.append((current_tick, actor_id, message, now))
+        journal_updates.append(('committed', json.dumps({'outcome': 'SUCCESS', 'reason': 'Message sent'}), current_tick, actor_id))
         results['success'] += 1
 
+    # Apply all resolved writes, one batched statement per table
+    cursor.executemany("UPDATE actors SET x = ?, y = ?, facing = ? WHERE id = ?", actor_moves)
+    cursor.executemany(
+        "INSERT INTO actor_history (actor_id, supertick_id, x, y, facing, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+        actor_history_rows
+    )
+    db_manager.set_tile_colors(conn, width, tile_paints)
+    cursor.executemany(
+        "INSERT INTO tile_history (x, y, supertick_id, actor_id, action_type, old_color, new_color, created_at) VALUES (?, ?, ?, ?, 'PAINT', ?, ?, ?)",
+        tile_history_rows
+    )
+    cursor.executemany(
+        "INSERT INTO chat (supertick_id, from_id, message, created_at) VALUES (?, ?, ?, ?)",
+        chat_rows
+    )
+    cursor.executemany(
+        "UPDATE journal SET status = ?, result_json = ? WHERE supertick_id = ? AND actor_id = ?",
+        journal_updates
+    )
+
     # Process WAIT and SKIP actions
     cursor.execute(
         "UPDATE journal SET status = 'committed', result_json = ? WHERE supertick_id = ? AND intent IN ('WAIT', 'SKIP') AND status = 'pending'",
@@ -313,24 +291,33 @@ def merge_and_advance_tick(namespace: str) -> Dict:
         FROM journal
         WHERE supertick_id = ? AND status IN ('committed', 'rejected')
         """,
-        (int(time.time()), current_tick)
+        (now, current_tick)
     )
 
-    # Advance tick
+    # Advance tick, pausing at the epoch limit
     next_tick = current_tick + 1
-    cursor.execute("UPDATE meta SET value = ? WHERE key = 'supertick_id'", (str(next_tick),))
-
-    # Update phase if needed
-    epoch = int(meta.get('epoch', 0))
     if next_tick >= epoch:
-        cursor.execute("UPDATE meta SET value = 'PAUSED' WHERE key = 'phase'")
+        new_phase = 'PAUSED'
         results['paused'] = True
         results['reason'] = f'Reached epoch limit ({epoch} ticks)'
     else:
-        cursor.execute("UPDATE meta SET value = 'COLLECT' WHERE key = 'phase'")
+        new_phase = 'COLLECT'
         results['paused'] = False
 
+    cursor.execute(
+        """
+        UPDATE meta SET value = CASE key WHEN 'supertick_id' THEN ? WHEN 'phase' THEN ? END
+        WHERE key IN ('supertick_id', 'phase')
+        """,
+        (str(next_tick), new_phase)
+    )
+
     conn.commit()
+
+    # Keep planner stats fresh as journal/audit/history tables grow
+    if next_tick % OPTIMIZE_EVERY_TICKS == 0:
+        conn.execute("PRAGMA optimize")
+
     conn.close()
 
     return results
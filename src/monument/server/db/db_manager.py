@@ -8,16 +8,33 @@ import json
 import re
 import secrets
 import sqlite3
+import string
+import struct
 import time
+from itertools import product
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 # Schema version must match PRAGMA user_version in schema.sql
-EXPECTED_SCHEMA_VERSION = 8
+EXPECTED_SCHEMA_VERSION = 9
+
+# Color of unpainted tiles (tile_palette id 0, so a zeroed blob is a blank world)
+DEFAULT_TILE_COLOR = "#FFFFFF"
+
+# Bytes per tile in world_tiles.data (little-endian tile_palette id)
+TILE_BYTES = 4
+TILE_FORMAT = "<I"
+
+# Row id of the single world_tiles row
+WORLD_TILES_ROW = 1
 
 # Namespace validation regex from design doc
 NAMESPACE_PATTERN = re.compile(r"^[a-zA-Z0-9][a-zA-Z0-9_-]{0,63}$")
 
+# Character sets equivalent to NAMESPACE_PATTERN, used on the hot path
+_NAMESPACE_FIRST = frozenset(string.ascii_letters + string.digits)
+_NAMESPACE_ALLOWED = frozenset(string.ascii_letters + string.digits + "_-")
+
 
 class NamespaceError(Exception):
     """Invalid namespace identifier."""
@@ -33,8 +50,16 @@ def validate_namespace(namespace: str) -> None:
     """
     Validate namespace identifier.
     Raises NamespaceError if invalid.
+
+    Equivalent to NAMESPACE_PATTERN, but checked with set lookups since
+    this runs on every get_db_path call.
     """
-    if not NAMESPACE_PATTERN.match(namespace):
+    if (
+        not namespace
+        or len(namespace) > 64
+        or namespace[0] not in _NAMESPACE_FIRST
+        or not _NAMESPACE_ALLOWED.issuperset(namespace)
+    ):
         raise NamespaceError(
             f"Invalid namespace '{namespace}'. "
             f"Must match pattern: ^[a-zA-Z0-9][a-zA-Z0-9_-]{{0,63}}$"
@@ -97,6 +122,9 @@ def get_connection(namespace: str) -> sqlite3.Connection:
     """
     Get a connection to the namespace DB.
     Lazy-creates and initializes DB if it doesn't exist.
+
+    Rows come back as plain tuples; callers that want column access by
+    name set row_factory = sqlite3.Row themselves.
     """
     db_path = get_db_path(namespace)
 
@@ -118,9 +146,7 @@ def get_connection(namespace: str) -> sqlite3.Connection:
             conn.close()
 
     # Return a fresh connection
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row  # Enable column access by name
-    return conn
+    return sqlite3.connect(db_path)
 
 
 def init_world(conn: sqlite3.Connection, width: int, height: int, goal: str = "", epoch: int = 10) -> None:
@@ -150,20 +176,64 @@ def init_world(conn: sqlite3.Connection, width: int, height: int, goal: str = ""
         meta_values
     )
 
-    # Create all tiles as blank/white
-    tiles = []
-    for x in range(width):
-        for y in range(height):
-            tiles.append((x, y, "#FFFFFF"))
-
-    cursor.executemany(
-        "INSERT OR REPLACE INTO tiles (x, y, color) VALUES (?, ?, ?)",
-        tiles
+    # Create all tiles as blank/white (palette id 0 everywhere)
+    cursor.execute(
+        "INSERT OR REPLACE INTO tile_palette (id, color) VALUES (0, ?)",
+        (DEFAULT_TILE_COLOR,)
+    )
+    cursor.execute(
+        "INSERT OR REPLACE INTO world_tiles (id, data) VALUES (?, zeroblob(?))",
+        (WORLD_TILES_ROW, width * height * TILE_BYTES)
     )
 
     conn.commit()
 
 
+def get_palette_id(conn: sqlite3.Connection, color: str) -> int:
+    """
+    Get the tile_palette id for a color, adding it to the palette if new.
+    """
+    conn.execute("INSERT OR IGNORE INTO tile_palette (color) VALUES (?)", (color,))
+    cursor = conn.execute("SELECT id FROM tile_palette WHERE color = ?", (color,))
+    return cursor.fetchone()[0]
+
+
+def get_tiles(conn: sqlite3.Connection) -> List[str]:
+    """
+    Get the current color of every tile in a single blob read.
+
+    Returns:
+        List of colors in row-major order (index = y * width + x)
+    """
+    palette = {row[0]: row[1] for row in conn.execute("SELECT id, color FROM tile_palette")}
+    cursor = conn.execute("SELECT data FROM world_tiles WHERE id = ?", (WORLD_TILES_ROW,))
+    data = cursor.fetchone()[0]
+    ids = struct.unpack(f"<{len(data) // TILE_BYTES}I", data)
+    return [palette[palette_id] for palette_id in ids]
+
+
+def set_tile_colors(conn: sqlite3.Connection, width: int, updates: List[Tuple[int, int, str]]) -> None:
+    """
+    Set the color of several tiles in place through a single blob handle.
+    Does not commit; the writes join the caller's transaction.
+
+    Args:
+        updates: List of (x, y, color)
+    """
+    if not updates:
+        return
+
+    # Resolve palette ids first; the palette INSERT also opens the transaction
+    writes = [
+        ((y * width + x) * TILE_BYTES, struct.pack(TILE_FORMAT, get_palette_id(conn, color)))
+        for x, y, color in updates
+    ]
+    with conn.blobopen("world_tiles", "data", WORLD_TILES_ROW) as blob:
+        for offset, packed in writes:
+            blob.seek(offset)
+            blob.write(packed)
+
+
 def register_actor(
     conn: sqlite3.Connection,
     actor_id: str,
@@ -350,10 +420,7 @@ def get_world_state_at_tick(conn: sqlite3.Connection, supertick_id: int) -> dict
     height = int(cursor.fetchone()[0])
 
     # Initialize all tiles as white (#FFFFFF)
-    tiles = {}
-    for x in range(width):
-        for y in range(height):
-            tiles[(x, y)] = "#FFFFFF"
+    tiles = dict.fromkeys(product(range(width), range(height)), DEFAULT_TILE_COLOR)
 
     # Apply all tile changes up to and including the requested supertick
     cursor = conn.execute(
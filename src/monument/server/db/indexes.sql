@@ -10,8 +10,8 @@ CREATE INDEX IF NOT EXISTS idx_tile_history_actor ON tile_history(actor_id);
 CREATE INDEX IF NOT EXISTS idx_actor_history_tick ON actor_history(supertick_id);
 CREATE INDEX IF NOT EXISTS idx_actor_history_actor ON actor_history(actor_id);
 
--- Journal lookups by tick
-CREATE INDEX IF NOT EXISTS idx_journal_tick ON journal(supertick_id);
+-- Journal lookups by tick and status (covers the pending-submission count)
+CREATE INDEX IF NOT EXISTS idx_journal_tick_status ON journal(supertick_id, status, actor_id);
 
 -- Audit lookups by tick and actor
 CREATE INDEX IF NOT EXISTS idx_audit_tick ON audit(supertick_id);
@@ -1,8 +1,8 @@
 -- Monument DB schema (per-namespace)
--- Schema version: 8
+-- Schema version: 9
 -- No ORM, no migrations; fail-fast on version mismatch
 
-PRAGMA user_version = 8;
+PRAGMA user_version = 9;
 
 -- Metadata table: stores simulation state
 CREATE TABLE IF NOT EXISTS meta (
@@ -10,13 +10,18 @@ CREATE TABLE IF NOT EXISTS meta (
     value TEXT
 ) WITHOUT ROWID;
 
--- Tiles: world grid state
-CREATE TABLE IF NOT EXISTS tiles (
-    x INTEGER NOT NULL,
-    y INTEGER NOT NULL,
-    color TEXT NOT NULL,
-    PRIMARY KEY (x, y)
-) WITHOUT ROWID;
+-- Tile palette: distinct tile colors, referenced by id from world_tiles
+CREATE TABLE IF NOT EXISTS tile_palette (
+    id INTEGER PRIMARY KEY,
+    color TEXT NOT NULL UNIQUE
+);
+
+-- World tiles: world grid state packed into a single row
+-- data is width*height 4-byte little-endian tile_palette ids, row-major (offset = (y*width + x) * 4)
+CREATE TABLE IF NOT EXISTS world_tiles (
+    id INTEGER PRIMARY KEY,
+    data BLOB NOT NULL
+);
 
 -- Tile history: audit trail of all tile changes
 CREATE TABLE IF NOT EXISTS tile_history (
@@ -7,10 +7,9 @@ import argparse
 import json
 import math
 import random
-import re
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
@@ -30,8 +29,7 @@ class ConfigError(Exception):
 
 def validate_namespace(namespace: str) -> None:
     """Validate namespace format."""
-    pattern = re.compile(r"^[a-zA-Z0-9][a-zA-Z0-9_-]{0,63}$")
-    if not pattern.match(namespace):
+    if not db_manager.NAMESPACE_PATTERN.match(namespace):
         raise ConfigError(
             f"Invalid namespace '{namespace}'. "
             f"Must match pattern: ^[a-zA-Z0-9][a-zA-Z0-9_-]{{0,63}}$"
@@ -58,7 +56,7 @@ def parse_position(
     position: Any,
     width: int,
     height: int,
-    occupied: set
+    occupied: bytearray
 ) -> Tuple[int, int]:
     """
     Parse position specification.
@@ -67,7 +65,7 @@ def parse_position(
         position: Can be "center", "random", or {"x": int, "y": int}
         width: World width
         height: World height
-        occupied: Set of already occupied positions
+        occupied: Bitmap of already occupied cells (index = y * width + x)
 
     Returns:
         (x, y) tuple
@@ -76,7 +74,7 @@ def parse_position(
         x = width // 2
         y = height // 2
         # If center is occupied, find nearest free spot
-        if (x, y) in occupied:
+        if occupied[y * width + x]:
             x, y = find_free_position(x, y, width, height, occupied)
         return (x, y)
 
@@ -102,50 +100,175 @@ def parse_position(
         raise ConfigError(f"Invalid position format: {position}. Use 'center', 'random', or {{x: int, y: int}}")
 
 
-def random_free_position(width: int, height: int, occupied: set) -> Tuple[int, int]:
+# Number of distinct random cells drawn per random_free_position call
+RANDOM_POSITION_BATCH = 1024
+
+
+def random_free_position(width: int, height: int, occupied: bytearray) -> Tuple[int, int]:
     """Find a random unoccupied position."""
-    max_attempts = width * height
-    for _ in range(max_attempts):
-        x = random.randint(0, width - 1)
-        y = random.randint(0, height - 1)
-        if (x, y) not in occupied:
-            return (x, y)
+    # Draw a batch of distinct cell indices in one call and take the first free one
+    cell_count = width * height
+    for idx in random.sample(range(cell_count), min(RANDOM_POSITION_BATCH, cell_count)):
+        if not occupied[idx]:
+            return (idx % width, idx // width)
 
     # If all random attempts fail, find any free position
-    for x in range(width):
-        for y in range(height):
-            if (x, y) not in occupied:
-                return (x, y)
+    idx = occupied.find(0)
+    if idx != -1:
+        return (idx % width, idx // width)
 
     raise ConfigError("No free positions available in the world")
 
 
+def scan_ring(
+    start_x: int,
+    start_y: int,
+    radius: int,
+    width: int,
+    height: int,
+    occupied: bytearray
+) -> Optional[Tuple[int, int]]:
+    """
+    Return the first free cell on the ring at `radius`, or None.
+
+    Walks only the perimeter of the ring: the full left and right columns,
+    and just the top and bottom cells of the columns in between.
+    """
+    full_column = range(-radius, radius + 1)
+    ends_only = (-radius, radius)
+    for dx in range(-radius, radius + 1):
+        x = start_x + dx
+        if not 0 <= x < width:
+            continue
+        for dy in (full_column if abs(dx) == radius else ends_only):
+            y = start_y + dy
+            if 0 <= y < height and not occupied[y * width + x]:
+                return (x, y)
+    return None
+
+
 def find_free_position(
     start_x: int,
     start_y: int,
     width: int,
     height: int,
-    occupied: set
+    occupied: bytearray
 ) -> Tuple[int, int]:
     """Find nearest free position using spiral search."""
     for radius in range(1, max(width, height)):
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                if abs(dx) != radius and abs(dy) != radius:
-                    continue  # Only check perimeter
-                x = start_x + dx
-                y = start_y + dy
-                if 0 <= x < width and 0 <= y < height and (x, y) not in occupied:
-                    return (x, y)
+        position = scan_ring(start_x, start_y, radius, width, height, occupied)
+        if position is not None:
+            return position
 
     raise ConfigError("No free positions available near the requested location")
 
 
+# Rings scanned directly before calculate_grid_positions falls back to FreeCellIndex
+LOCAL_SEARCH_RADIUS = 8
+
+
+class FreeCellIndex:
+    """
+    2D Fenwick tree counting free cells, for repeated nearest-free lookups.
+
+    Counts the free cells in any rectangle in O(log W * log H), so the
+    spiral search can binary-search the first ring holding a free cell
+    instead of walking every ring in between. Returns the same cell as
+    find_free_position.
+    """
+
+    def __init__(self, width: int, height: int, occupied: bytearray):
+        self.width = width
+        self.height = height
+
+        # Linear-time build: seed with free flags, then push partial sums up each axis
+        tree = [[0] * (width + 1)]
+        for y in range(height):
+            row = [0]
+            row.extend(0 if cell else 1 for cell in occupied[y * width:(y + 1) * width])
+            for i in range(1, width + 1):
+                j = i + (i & -i)
+                if j <= width:
+                    row[j] += row[i]
+            tree.append(row)
+        for i in range(1, height + 1):
+            j = i + (i & -i)
+            if j <= height:
+                parent, child = tree[j], tree[i]
+                for k in range(1, width + 1):
+                    parent[k] += child[k]
+        self.tree = tree
+
+    def mark_occupied(self, x: int, y: int) -> None:
+        """Remove a newly occupied (previously free) cell from the counts."""
+        i = y + 1
+        while i <= self.height:
+            row = self.tree[i]
+            j = x + 1
+            while j <= self.width:
+                row[j] -= 1
+                j += j & -j
+            i += i & -i
+
+    def _prefix(self, x: int, y: int) -> int:
+        """Free cells in columns [0, x) and rows [0, y)."""
+        total = 0
+        i = y
+        while i > 0:
+            row = self.tree[i]
+            j = x
+            while j > 0:
+                total += row[j]
+                j -= j & -j
+            i -= i & -i
+        return total
+
+    def count_free(self, x0: int, y0: int, x1: int, y1: int) -> int:
+        """Free cells in the inclusive rectangle, clipped to the world."""
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(self.width - 1, x1), min(self.height - 1, y1)
+        if x0 > x1 or y0 > y1:
+            return 0
+        return (
+            self._prefix(x1 + 1, y1 + 1) - self._prefix(x0, y1 + 1)
+            - self._prefix(x1 + 1, y0) + self._prefix(x0, y0)
+        )
+
+    def find_free_position(
+        self, start_x: int, start_y: int, occupied: bytearray, min_radius: int = 1
+    ) -> Tuple[int, int]:
+        """
+        Find nearest free position; same result as the module-level spiral search.
+
+        Rings below min_radius are assumed to have been scanned already.
+        """
+        # The start cell itself is never a candidate
+        start_free = 0 if occupied[start_y * self.width + start_x] else 1
+
+        def free_within(radius: int) -> int:
+            return self.count_free(
+                start_x - radius, start_y - radius, start_x + radius, start_y + radius
+            ) - start_free
+
+        # Free counts only grow with the radius, so the first ring with a free cell is a binary search away
+        low, high = max(1, min_radius), max(self.width, self.height) - 1
+        if high < low or free_within(high) == 0:
+            raise ConfigError("No free positions available near the requested location")
+        while low < high:
+            mid = (low + high) // 2
+            if free_within(mid) > 0:
+                high = mid
+            else:
+                low = mid + 1
+
+        return scan_ring(start_x, start_y, low, self.width, self.height, occupied)
+
+
 def calculate_grid_positions(
     count: int,
     width: int,
     height: int,
-    occupied: set
+    occupied: bytearray
 ) -> List[Tuple[int, int]]:
     """
     Calculate grid positions for bulk agent placement.
@@ -159,6 +282,10 @@ def calculate_grid_positions(
     x_spacing = width / (grid_cols + 1)
     y_spacing = height / (grid_rows + 1)
 
+    # Built the first time a collision can't be resolved nearby, then kept in sync with `occupied`
+    free_cells = None
+    local_radius = min(LOCAL_SEARCH_RADIUS, max(width, height) - 1)
+
     for i in range(count):
         row = i // grid_cols
         col = i % grid_cols
@@ -166,12 +293,23 @@ def calculate_grid_positions(
         x = min(width - 1, max(0, int(round((col + 1) * x_spacing) - 1)))
         y = min(height - 1, max(0, int(round((row + 1) * y_spacing) - 1)))
 
-        # If position is occupied, find nearest free spot
-        if (x, y) in occupied:
-            x, y = find_free_position(x, y, width, height, occupied)
+        # If position is occupied, find nearest free spot: nearby rings first, then the index
+        if occupied[y * width + x]:
+            position = None
+            for radius in range(1, local_radius + 1):
+                position = scan_ring(x, y, radius, width, height, occupied)
+                if position is not None:
+                    break
+            if position is None:
+                if free_cells is None:
+                    free_cells = FreeCellIndex(width, height, occupied)
+                position = free_cells.find_free_position(x, y, occupied, local_radius + 1)
+            x, y = position
 
         positions.append((x, y))
-        occupied.add((x, y))
+        occupied[y * width + x] = 1
+        if free_cells is not None:
+            free_cells.mark_occupied(x, y)
 
     return positions
 
@@ -199,7 +337,7 @@ def process_individual_agent(
     agent_config: Dict[str, Any],
     width: int,
     height: int,
-    occupied: set
+    occupied: bytearray
 ) -> Dict[str, Any]:
     """Process an individual agent definition."""
     agent_id = agent_config.get("id")
@@ -209,7 +347,7 @@ def process_individual_agent(
     # Parse position
     position = agent_config.get("position", "random")
     x, y = parse_position(position, width, height, occupied)
-    occupied.add((x, y))
+    occupied[y * width + x] = 1
 
     # Validate facing
     facing = agent_config.get("facing", "N")
@@ -244,7 +382,7 @@ def process_bulk_agents(
     agent_config: Dict[str, Any],
     width: int,
     height: int,
-    occupied: set
+    occupied: bytearray
 ) -> List[Dict[str, Any]]:
     """Process a bulk agent definition."""
     prefix = agent_config.get("prefix")
@@ -274,9 +412,9 @@ def process_bulk_agents(
     else:  # random
         positions = []
         for _ in range(count):
-            pos = random_free_position(width, height, occupied)
-            positions.append(pos)
-            occupied.add(pos)
+            x, y = random_free_position(width, height, occupied)
+            positions.append((x, y))
+            occupied[y * width + x] = 1
 
     # Get optional fields
     instructions = agent_config.get("instructions", "")
@@ -339,7 +477,7 @@ def process_agents(
 ) -> List[Dict[str, Any]]:
     """Process all agent configurations."""
     processed_agents = []
-    occupied = set()
+    occupied = bytearray(width * height)  # 1 = occupied, index = y * width + x
 
     for agent_config in agents_config:
         if "id" in agent_config:
@@ -1,19 +1,33 @@
 """
 GIF exporter for Monument simulations.
-Reads a data.json from export_sim output and produces a replay GIF.
+Reads a data.json from export_sim output and produces a replay GIF
+(or an MP4/WebM video when imageio with ffmpeg is installed).
 """
 
 import argparse
 import json
+import math
+from array import array
+from functools import lru_cache
+from itertools import islice, pairwise
+from multiprocessing import Pool
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageColor, ImageDraw, ImageFont
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # optional: the stdlib parser reads the same files, just slower
+    json_loads = json.loads
 
-def load_font(size: int) -> ImageFont.ImageFont:
+
+@lru_cache(maxsize=None)
+def find_font_path() -> str | None:
     """
-    Try a handful of system fonts for decent readability; fall back to default.
+    Try a handful of system fonts for decent readability; returns the first one found.
+    Probed once per process, then every size loads straight from the resolved path.
     """
     font_candidates = [
         "Inter-Regular.ttf",
@@ -25,16 +39,28 @@ def load_font(size: int) -> ImageFont.ImageFont:
     ]
     for name in font_candidates:
         try:
-            return ImageFont.truetype(name, size)
+            return ImageFont.truetype(name).path
         except OSError:
             continue
-    return ImageFont.load_default()
+    return None
+
+
+def load_font(size: int) -> ImageFont.ImageFont:
+    """
+    Load the system font from find_font_path at the given size; fall back to Pillow's bundled font.
+    """
+    font_path = find_font_path()
+    if font_path is None:
+        return ImageFont.load_default(size)
+    return ImageFont.truetype(font_path, size)
 
 
 TITLE_FONT = load_font(26)
 SECTION_FONT = load_font(18)
 BODY_FONT = load_font(15)
 SMALL_FONT = load_font(13)
+# Measures text (including multiline) without a real canvas
+TEXT_PROBE = ImageDraw.Draw(Image.new("L", (1, 1)))
 
 CANVAS_WIDTH = 1280
 CANVAS_HEIGHT = 720
@@ -44,10 +70,30 @@ PANEL_DARK = (31, 36, 50)
 TEXT_COLOR = (234, 237, 243)
 MUTED_TEXT = (156, 167, 190)
 ACCENT_COLOR = (255, 193, 94)
+AGENT_COLOR = (8, 9, 12)
+SNIPPET_COLOR = (184, 192, 211)
 MAX_ACTIONS_DISPLAY = 5
 MAX_CHAT_LINES = 5
-
-
+FRAME_CHUNKSIZE = 8
+# Output suffix -> ffmpeg codec for video replays
+VIDEO_CODECS = {".mp4": "libx264", ".webm": "libvpx-vp9"}
+GIF_PALETTE_SIZE = 256
+TEXT_RAMP_STEPS = 8
+LABEL_RAMP_STEPS = 4
+# Text color over background, for every combination the layout draws
+TEXT_BLENDS = [
+    (TEXT_COLOR, PANEL_COLOR),
+    (TEXT_COLOR, PANEL_DARK),
+    (TEXT_COLOR, BACKGROUND_COLOR),
+    (MUTED_TEXT, PANEL_COLOR),
+    (MUTED_TEXT, PANEL_DARK),
+    (MUTED_TEXT, BACKGROUND_COLOR),
+    (SNIPPET_COLOR, PANEL_DARK),
+    (ACCENT_COLOR, AGENT_COLOR),
+]
+
+
+@lru_cache(maxsize=4096)
 def normalize_color(color: str) -> str:
     if not color:
         return "#FFFFFF"
@@ -65,18 +111,122 @@ def normalize_color(color: str) -> str:
     return "#FFFFFF"
 
 
+def iter_columns(entries: Any, *fields: str) -> Iterator[Tuple[Any, ...]]:
+    """
+    Rows of the given fields from a tick category. export_sim writes tile_updates and
+    actor_positions column-wise ({"x": [...], ...}); older bundles list one object per row.
+    """
+    if isinstance(entries, dict):
+        return zip(*(entries[field] for field in fields))
+    return (tuple(entry.get(field) for field in fields) for entry in entries)
+
+
+def build_palette(
+    ticks: Iterable[Dict[str, Any]], base_color: str
+) -> Tuple[Dict[str, int], List[Tuple[int, int, int]]]:
+    """
+    Number every tile color the replay can show, once per run.
+
+    Returns color -> index and index -> RGB. Colors that normalize to the same RGB
+    share an index; the base color is index 0.
+    """
+    color_index: Dict[str, int] = {}
+    rgb_index: Dict[Tuple[int, int, int], int] = {}
+
+    def add(color: str) -> None:
+        if color not in color_index:
+            rgb = ImageColor.getrgb(normalize_color(color))
+            color_index[color] = rgb_index.setdefault(rgb, len(rgb_index))
+
+    add(base_color)
+    for tick in ticks:
+        for (color,) in iter_columns(tick.get("tile_updates", []), "new_color"):
+            add(base_color if color is None else color)
+    return color_index, list(rgb_index)
+
+
+def blend_ramp(fg: Tuple[int, int, int], bg: Tuple[int, int, int], steps: int) -> List[Tuple[int, int, int]]:
+    """Colors strictly between bg and fg, as antialiased text edges produce them."""
+    return [tuple(round(b + (f - b) * k / steps) for f, b in zip(fg, bg)) for k in range(1, steps)]
+
+
+def build_gif_palette(tile_colors: Iterable[Tuple[int, int, int]]) -> Image.Image | None:
+    """
+    Fixed palette for a whole replay: UI colors, tile colors, and the blends antialiased text lands on.
+
+    Returns None when the tile colors don't fit, leaving quantization to the GIF writer.
+    """
+    tile_colors = list(dict.fromkeys(tile_colors))
+    base = [BACKGROUND_COLOR, PANEL_COLOR, PANEL_DARK, TEXT_COLOR, MUTED_TEXT, ACCENT_COLOR, AGENT_COLOR, SNIPPET_COLOR]
+    colors = list(dict.fromkeys(base + tile_colors))
+    for fg, bg in TEXT_BLENDS:
+        colors.extend(blend_ramp(fg, bg, TEXT_RAMP_STEPS))
+    colors = list(dict.fromkeys(colors))
+    if len(colors) > GIF_PALETTE_SIZE:
+        return None
+
+    # Agent labels spill over neighbouring tiles; add those blends while there is room
+    label_blends = list(dict.fromkeys(
+        color for tile in tile_colors for color in blend_ramp(ACCENT_COLOR, tile, LABEL_RAMP_STEPS)
+    ))
+    colors = list(dict.fromkeys(colors + label_blends))[:GIF_PALETTE_SIZE]
+
+    colors.extend([colors[0]] * (GIF_PALETTE_SIZE - len(colors)))
+    palette = Image.new("P", (1, 1))
+    palette.putpalette([channel for color in colors for channel in color])
+    return palette
+
+
+@lru_cache(maxsize=1024)
+def text_mask(text: str, font: ImageFont.ImageFont, start: Tuple[float, float]) -> Tuple[Image.Image, int, int]:
+    """
+    Rasterize text once as an "L" mask; returns the mask and where the text origin sits inside it.
+    """
+    left, top, right, bottom = TEXT_PROBE.textbbox((0, 0), text, font=font)
+    pad_x = max(0, -math.floor(left)) + 1
+    pad_y = max(0, -math.floor(top)) + 1
+    mask = Image.new("L", (math.ceil(right) + pad_x + 2, math.ceil(bottom) + pad_y + 2))
+    ImageDraw.Draw(mask).text((pad_x + start[0], pad_y + start[1]), text, fill=255, font=font)
+    return mask, pad_x, pad_y
+
+
+def paste_text(
+    img: Image.Image, xy: Tuple[float, float], text: str, fill: Tuple[int, int, int], font: ImageFont.ImageFont
+) -> None:
+    """
+    Pixel-identical stand-in for draw.text for strings that repeat across frames.
+    """
+    x, y = xy
+    # Same subpixel start draw.text would use, so the cached mask matches it exactly
+    start = (round(math.modf(x)[0], 2), round(math.modf(y)[0], 2))
+    mask, pad_x, pad_y = text_mask(text, font, start)
+    img.paste(fill, (int(x) - pad_x, int(y) - pad_y), mask)
+
+
 def load_data(data_path: Path) -> Dict[str, Any]:
-    with data_path.open("r", encoding="utf-8") as fp:
-        return json.load(fp)
+    # Both parsers accept the raw UTF-8 bytes; orjson parses them without building a str first
+    return json_loads(data_path.read_bytes())
 
 
+@lru_cache(maxsize=4096)
 def safe_text(text: str, limit: int = 100) -> str:
     if not text:
         return ""
-    text = text.replace("\n", " ").strip()
+    # Line breaks and tabs become spaces so every snippet renders on one line
+    text = text.replace("\n", " ").replace("\r", " ").replace("\t", " ").strip()
     return text if len(text) <= limit else text[: limit - 1] + "…"
 
 
+@lru_cache(maxsize=8)
+def frame_background(width: int, height: int, grid_panel_box: Tuple[float, float, float, float]) -> Image.Image:
+    """
+    The part of every frame drawn before any replay state; callers paint on a copy.
+    """
+    img = Image.new("RGB", (width, height), color=BACKGROUND_COLOR)
+    ImageDraw.Draw(img).rounded_rectangle(grid_panel_box, radius=18, fill=PANEL_COLOR)
+    return img
+
+
 def layout_frame(
     state: Dict[str, Any],
     tick: Dict[str, Any],
@@ -84,9 +234,6 @@ def layout_frame(
     width: int = CANVAS_WIDTH,
     height: int = CANVAS_HEIGHT,
 ) -> Image.Image:
-    img = Image.new("RGB", (width, height), color=BACKGROUND_COLOR)
-    draw = ImageDraw.Draw(img)
-
     padding = 26
     grid_panel_width = int(width * 0.52)
     grid_panel_height = int(height * 0.68)
@@ -94,11 +241,11 @@ def layout_frame(
     grid_panel_y = padding * 2.2
 
     # Grid background
-    draw.rounded_rectangle(
-        [grid_panel_x - 12, grid_panel_y - 12, grid_panel_x + grid_panel_width, grid_panel_y + grid_panel_height],
-        radius=18,
-        fill=PANEL_COLOR
+    grid_panel_box = (
+        grid_panel_x - 12, grid_panel_y - 12, grid_panel_x + grid_panel_width, grid_panel_y + grid_panel_height
     )
+    img = frame_background(width, height, grid_panel_box).copy()
+    draw = ImageDraw.Draw(img)
 
     world_w = state["width"]
     world_h = state["height"]
@@ -108,33 +255,33 @@ def layout_frame(
     grid_origin_x = grid_panel_x + 12
     grid_origin_y = grid_panel_y + 12
 
-    # Draw tiles
-    for idx, color in enumerate(tick["tiles"]):
-        x = idx % world_w
-        y = idx // world_w
-        cx = grid_origin_x + x * cell_size
-        cy = grid_origin_y + y * cell_size
-        draw.rectangle(
-            [cx, cy, cx + cell_size - 1, cy + cell_size - 1],
-            fill=normalize_color(color),
-            outline=None
-        )
+    # Draw tiles: one pixel per cell, scaled up to cell_size and pasted in a single call
+    tile_palette = state["tile_palette"]
+    if tile_palette is not None:
+        tile_grid = Image.frombytes("P", (world_w, world_h), bytes(tick["tiles"]))
+        tile_grid.putpalette(tile_palette)
+        tile_grid = tile_grid.convert("RGB")
+    else:
+        tile_rgb = state["tile_rgb"]
+        tile_grid = Image.new("RGB", (world_w, world_h))
+        tile_grid.putdata([tile_rgb[index] for index in tick["tiles"]])
+    # Every cell sits on the integer grid origin; the fractional part is shared by all of them
+    tiles_x, tiles_y = int(grid_origin_x), int(grid_origin_y)
+    img.paste(
+        tile_grid.resize((world_w * cell_size, world_h * cell_size), Image.Resampling.NEAREST),
+        (tiles_x, tiles_y)
+    )
 
     # Draw agents
     label_font = BODY_FONT if cell_size >= 12 else SMALL_FONT
-    for actor_id, actor in tick["actors"].items():
-        cx = grid_origin_x + actor["x"] * cell_size
-        cy = grid_origin_y + actor["y"] * cell_size
-        draw.rectangle(
-            [cx, cy, cx + cell_size - 1, cy + cell_size - 1],
-            fill=(8, 9, 12)
-        )
-        draw.text(
-            (cx + 2, cy + 2),
-            actor_id,
-            fill=ACCENT_COLOR,
-            font=label_font
-        )
+    # Same subpixel start paste_text would use; it is shared by every cell
+    label_start = (round(math.modf(grid_origin_x)[0], 2), round(math.modf(grid_origin_y)[0], 2))
+    for actor_id, (actor_x, actor_y) in tick["actors"].items():
+        cx = tiles_x + actor_x * cell_size
+        cy = tiles_y + actor_y * cell_size
+        img.paste(AGENT_COLOR, (cx, cy, cx + cell_size, cy + cell_size))
+        mask, pad_x, pad_y = text_mask(actor_id, label_font, label_start)
+        img.paste(ACCENT_COLOR, (cx + 2 - pad_x, cy + 2 - pad_y), mask)
 
     # Actions panel: widen viewpoint for longer snippets
     actions_panel_x = grid_panel_x + grid_panel_width + padding
@@ -146,13 +293,14 @@ def layout_frame(
         radius=18,
         fill=PANEL_COLOR
     )
+    # The header changes every tick, so caching its mask would only churn the cache
     draw.text(
         (actions_panel_x, actions_panel_top - 32),
         f"Tick {tick['id']}  ·  Goal: {safe_text(state.get('goal'), 80)}",
         fill=MUTED_TEXT,
         font=SMALL_FONT
     )
-    draw.text((actions_panel_x, actions_panel_top - 8), "Recent Actions", fill=TEXT_COLOR, font=SECTION_FONT)
+    paste_text(img, (actions_panel_x, actions_panel_top - 8), "Recent Actions", fill=TEXT_COLOR, font=SECTION_FONT)
 
     if visible_actions is None:
         visible_actions = tick["actions"][-MAX_ACTIONS_DISPLAY:]
@@ -174,7 +322,8 @@ def layout_frame(
             fill=PANEL_DARK
         )
         text_x = actions_panel_x + 14
-        draw.text(
+        paste_text(
+            img,
             (text_x, card_y + 8),
             f"{action['actor_id']} • {action['action_type']} {param_str}",
             fill=TEXT_COLOR,
@@ -183,7 +332,8 @@ def layout_frame(
         outcome_line = outcome
         if reason:
             outcome_line += f" — {reason}"
-        draw.text(
+        paste_text(
+            img,
             (text_x, card_y + 32),
             outcome_line,
             fill=MUTED_TEXT,
@@ -191,16 +341,18 @@ def layout_frame(
         )
         snippet = safe_text(action.get("llm_output") or "", 80)
         if snippet:
-            draw.text(
+            paste_text(
+                img,
                 (text_x, card_y + 50),
                 f"“{snippet}”",
-                fill=(184, 192, 211),
+                fill=SNIPPET_COLOR,
                 font=SMALL_FONT
             )
         card_y += card_height + 10
 
     if not visible_actions:
-        draw.text(
+        paste_text(
+            img,
             (actions_panel_x, actions_panel_top + 30),
             "No actions yet",
             fill=MUTED_TEXT,
@@ -215,13 +367,14 @@ def layout_frame(
         radius=18,
         fill=PANEL_COLOR
     )
-    draw.text((padding + 16, chat_panel_y - 4), "Chat", fill=TEXT_COLOR, font=SECTION_FONT)
+    paste_text(img, (padding + 16, chat_panel_y - 4), "Chat", fill=TEXT_COLOR, font=SECTION_FONT)
     chat_lines = list(reversed(tick["chats"][-MAX_CHAT_LINES:]))
     if chat_lines:
         line_y = chat_panel_y + 26
         for chat in chat_lines:
             msg = safe_text(chat.get("message", ""), 110)
-            draw.text(
+            paste_text(
+                img,
                 (padding + 24, line_y),
                 f"[tick {chat.get('tick')}] {chat.get('from_id')}: {msg}",
                 fill=MUTED_TEXT,
@@ -229,52 +382,74 @@ def layout_frame(
             )
             line_y += 24
     else:
-        draw.text(
+        paste_text(
+            img,
             (padding + 24, chat_panel_y + 26),
             "No chat messages yet",
             fill=MUTED_TEXT,
             font=BODY_FONT
         )
 
+    gif_palette = state.get("gif_palette")
+    if gif_palette is not None:
+        # One lookup pass against the replay palette instead of an adaptive quantizer per frame
+        return img.quantize(palette=gif_palette, dither=Image.Dither.NONE)
     return img
 
 
-def build_frames(data_path: Path, max_ticks: int | None = None) -> List[Image.Image]:
+def iter_frame_specs(
+    data_path: Path, max_ticks: int | None = None, palettize: bool = True
+) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any], List[Dict[str, Any]] | None]]:
+    """
+    Walk the replay and yield the (state, tick_snapshot, visible_actions) arguments for each frame.
+
+    Snapshots share the live replay buffers, so each one must be used before the next is requested.
+    """
     data = load_data(data_path)
     width = int(data["meta"].get("width", 64))
     height = int(data["meta"].get("height", 64))
     base_color = data["meta"].get("default_color", "#FFFFFF")
 
-    ticks = sorted(data["ticks"], key=lambda t: t["supertick_id"])
-    tiles = [base_color] * (width * height)
-    actors = {}
+    # export_sim already writes ticks in order; only sort files that aren't
+    ticks = data["ticks"]
+    tick_key = itemgetter("supertick_id")
+    if any(tick_key(a) > tick_key(b) for a, b in pairwise(ticks)):
+        ticks = sorted(ticks, key=tick_key)
+    color_index, tile_rgb = build_palette(ticks, base_color)
+    # Palette indices, one per tile, so snapshots and rendering work on flat buffers
+    if len(tile_rgb) <= 256:
+        tiles = bytearray(width * height)
+    else:
+        tiles = array("H", bytes(2 * width * height))
+    # actor_id -> (x, y); the rest of the position record is never drawn
+    actors: Dict[str, Tuple[int, int]] = {}
     actions = []
     chats = []
-    frames = []
+    frame_count = 0
 
     state = {
         "namespace": data["namespace"],
         "width": width,
         "height": height,
         "goal": data["meta"].get("goal", "None"),
+        "tile_rgb": tile_rgb,
+        "tile_palette": bytes(channel for rgb in tile_rgb for channel in rgb) if len(tile_rgb) <= 256 else None,
+        "gif_palette": build_gif_palette(tile_rgb) if palettize else None,
     }
 
     if not ticks:
-        frames.append(layout_frame(state, {"id": 0, "tiles": tiles[:], "actors": {}, "actions": [], "chats": []}))
-        return frames
+        yield state, {"id": 0, "tiles": tiles, "actors": {}, "actions": [], "chats": []}, None
+        return
 
     for tick in ticks:
-        if max_ticks is not None and len(frames) >= max_ticks:
+        if max_ticks is not None and frame_count >= max_ticks:
             break
         tick_id = tick["supertick_id"]
-        for update in tick.get("tile_updates", []):
-            x = update["x"]
-            y = update["y"]
-            idx = y * width + x
-            tiles[idx] = update.get("new_color", base_color)
+        for x, y, color in iter_columns(tick.get("tile_updates", []), "x", "y", "new_color"):
+            tiles[y * width + x] = color_index[base_color if color is None else color]
 
-        for pos in tick.get("actor_positions", []):
-            actors[pos["actor_id"]] = pos
+        for actor_id, x, y in iter_columns(tick.get("actor_positions", []), "actor_id", "x", "y"):
+            actors[actor_id] = (x, y)
 
         for action in tick.get("actions", []):
             actions.append(action)
@@ -285,44 +460,109 @@ def build_frames(data_path: Path, max_ticks: int | None = None) -> List[Image.Im
                 chat_entry["tick"] = tick_id
             chats.append(chat_entry)
 
+        # The live buffers are safe to share: each spec is used before the next tick mutates them
         tick_snapshot = {
             "id": tick_id,
-            "tiles": tiles[:],
-            "actors": {k: dict(v) for k, v in actors.items()},
-            "actions": actions[:],
-            "chats": chats[:],
+            "tiles": tiles,
+            "actors": actors,
+            "actions": actions,
+            "chats": chats,
         }
 
         action_count = len(actions)
         if action_count == 0:
-            frames.append(layout_frame(state, tick_snapshot))
+            frame_count += 1
+            yield state, tick_snapshot, None
         else:
-            chunks = []
-            start = action_count
-            while start > 0 and len(chunks) < 2:
-                end = start
-                start = max(0, start - MAX_ACTIONS_DISPLAY)
-                chunk = actions[start:end]
-                unique_actor_ids = sorted({a.get("actor_id", "") for a in chunk})
-                chunk = sorted(chunk, key=lambda a: unique_actor_ids.index(a.get("actor_id", "")) if a.get("actor_id", "") in unique_actor_ids else 0)
-                chunks.append(chunk)
+            # Newest two pages of MAX_ACTIONS_DISPLAY actions, each ordered by actor (stable within an actor)
+            last_page_end = max(0, action_count - 2 * MAX_ACTIONS_DISPLAY)
+            for end in range(action_count, last_page_end, -MAX_ACTIONS_DISPLAY):
+                chunk = sorted(
+                    actions[max(0, end - MAX_ACTIONS_DISPLAY):end],
+                    key=lambda a: a.get("actor_id", "")
+                )
+                frame_count += 1
+                yield state, tick_snapshot, chunk
+
+
+def freeze_frame_spec(
+    spec: Tuple[Dict[str, Any], Dict[str, Any], List[Dict[str, Any]] | None]
+) -> Tuple[Dict[str, Any], Dict[str, Any], List[Dict[str, Any]] | None]:
+    """
+    Copy out the parts of a snapshot layout_frame reads, so the spec outlives the live buffers.
+    """
+    state, tick, visible_actions = spec
+    snapshot = {
+        "id": tick["id"],
+        "tiles": tick["tiles"][:],
+        "actors": dict(tick["actors"]),
+        "actions": tick["actions"][-MAX_ACTIONS_DISPLAY:],
+        "chats": tick["chats"][-MAX_CHAT_LINES:],
+    }
+    return state, snapshot, visible_actions
+
 
-            for chunk in chunks:
-                frames.append(layout_frame(state, tick_snapshot, visible_actions=chunk))
+def render_frame_spec(spec: Tuple[Dict[str, Any], Dict[str, Any], List[Dict[str, Any]] | None]) -> Image.Image:
+    return layout_frame(*spec)
 
-    return frames
 
+def iter_frames(
+    data_path: Path, max_ticks: int | None = None, workers: int = 1, palettize: bool = True
+) -> Iterator[Image.Image]:
+    """
+    Yield replay frames one at a time so the GIF writer can encode them as they are rendered.
 
-def export_gif(data_path: Path, output_path: Path, max_ticks: int | None = None) -> None:
-    frames = build_frames(data_path, max_ticks=max_ticks)
-    frames[0].save(
+    With workers > 1, frames are rendered by a process pool, a bounded batch at a time so
+    memory stays flat however long the replay is. palettize=False keeps frames in RGB.
+    """
+    specs = iter_frame_specs(data_path, max_ticks=max_ticks, palettize=palettize)
+    if workers <= 1:
+        for spec in specs:
+            yield render_frame_spec(spec)
+        return
+
+    frozen_specs = map(freeze_frame_spec, specs)
+    with Pool(workers) as pool:
+        while batch := list(islice(frozen_specs, workers * FRAME_CHUNKSIZE * 2)):
+            yield from pool.imap(render_frame_spec, batch, chunksize=FRAME_CHUNKSIZE)
+
+
+def export_video(data_path: Path, output_path: Path, max_ticks: int | None = None, workers: int = 1) -> None:
+    """
+    Encode the replay with ffmpeg through imageio; frames stay 24-bit, with no palette step.
+    """
+    try:
+        import imageio.v2 as imageio
+        import numpy as np
+    except ImportError as exc:
+        raise SystemExit("Video export needs imageio with ffmpeg support: pip install 'imageio[ffmpeg]'") from exc
+
+    codec = VIDEO_CODECS[output_path.suffix.lower()]
+    # One frame per second, matching the GIF's frame duration
+    with imageio.get_writer(output_path, fps=1, codec=codec, quality=7) as writer:
+        for frame in iter_frames(data_path, max_ticks=max_ticks, workers=workers, palettize=False):
+            writer.append_data(np.asarray(frame))
+
+
+def export_gif(data_path: Path, output_path: Path, max_ticks: int | None = None, workers: int = 1) -> None:
+    if output_path.suffix.lower() in VIDEO_CODECS:
+        export_video(data_path, output_path, max_ticks=max_ticks, workers=workers)
+        return
+
+    frames = iter_frames(data_path, max_ticks=max_ticks, workers=workers)
+    first = next(frames)
+    # disposal=1 leaves each frame under the next, so the writer only encodes the region that changed;
+    # pixel-identical consecutive frames are merged into one longer frame by Pillow
+    first.save(
         output_path,
         format="GIF",
         save_all=True,
-        append_images=frames[1:],
+        append_images=frames,
         loop=0,
         duration=1000,
-        disposal=2,
+        disposal=1,
+        # Frames on the shared replay palette don't need the writer's per-frame palette remapping
+        optimize=first.mode != "P",
     )
 
 
@@ -336,7 +576,10 @@ def parse_args() -> argparse.Namespace:
         "--output",
         "-o",
         default=None,
-        help="Output GIF path (default: same folder as data.json, named replay.gif)",
+        help=(
+            "Output GIF path (default: same folder as data.json, named replay.gif); "
+            "a .mp4 or .webm path writes a video instead (needs imageio[ffmpeg])"
+        ),
     )
     parser.add_argument(
         "--max-ticks",
@@ -344,6 +587,12 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Limit the number of ticks to render (processing stops once this many frames have been created)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Render frames in this many worker processes (default: 1, render in-process)",
+    )
     return parser.parse_args()
 
 
@@ -353,8 +602,8 @@ def main():
     if not data_path.exists():
         raise SystemExit(f"data.json not found: {data_path}")
     output_path = Path(args.output) if args.output else data_path.with_name("replay.gif")
-    export_gif(data_path, output_path, max_ticks=args.max_ticks)
-    print(f"Saved replay GIF to {output_path}")
+    export_gif(data_path, output_path, max_ticks=args.max_ticks, workers=args.workers)
+    print(f"Saved replay {'video' if output_path.suffix.lower() in VIDEO_CODECS else 'GIF'} to {output_path}")
 
 
 if __name__ == "__main__":